@@ -1,3 +1,5 @@
+from decimal import Context, Decimal, ROUND_DOWN
+
 EVM_TOKEN_CONFIGS = {
     "bsc": {
         "bnb": {
@@ -29,4 +31,32 @@ EVM_TOKEN_CONFIGS = {
             "decimals": 18
         }
     }
-}
\ No newline at end of file
+}
+
+# Flat (chain, token) -> (contract_address, decimals) lookup for ERC20 transfers
+EVM_TOKEN_TABLE = {
+    (chain, token): (token_config["contract_address"], token_config["decimals"])
+    for chain, tokens in EVM_TOKEN_CONFIGS.items()
+    for token, token_config in tokens.items()
+    if "contract_address" in token_config
+}
+
+
+# Decimal scaling factor (10 ** decimals) for every decimals value above, built once at import
+DECIMAL_SCALES = {
+    token_config["decimals"]: Decimal(10) ** token_config["decimals"]
+    for tokens in EVM_TOKEN_CONFIGS.values()
+    for token_config in tokens.values()
+}
+
+# Wide enough for any uint256 amount, so scaling a value never rounds under the default 28-digit context
+_BASE_UNITS_CONTEXT = Context(prec=80)
+
+
+def to_base_units(value, decimals):
+    """
+    Converts a human-readable amount (e.g. "0.001") into integer base units (e.g. wei),
+    truncating anything below one base unit.
+    """
+    scaled = _BASE_UNITS_CONTEXT.multiply(Decimal(value), DECIMAL_SCALES[decimals])
+    return int(scaled.to_integral_value(rounding=ROUND_DOWN))
@@ -1,30 +1,64 @@
 import json
 import base64
-import requests
+import asyncio
+import aiohttp
+from functools import lru_cache
 
-def push_tx(path, access_token, signature, timestamp, request_body):
+FORDEFI_API_URL = "https://api.fordefi.com"
 
+# Only 429 is retried: the API rejected the request without creating a transaction.
+# 5xx responses are not, since the transfer may already have gone through.
+RETRY_STATUSES = {429}
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.2
+
+
+def create_session():
+    """
+    Opens the aiohttp session used for every Fordefi API call. Requests are sent
+    relative to FORDEFI_API_URL over a pooled keep-alive connector.
+    """
+    connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=75)
+    return aiohttp.ClientSession(base_url=FORDEFI_API_URL, connector=connector)
+
+
+@lru_cache(maxsize=4)
+def _base_headers(access_token):
+    # Only x-signature / x-timestamp change per request; the rest is built once per token.
+    # Content-Type is explicit since aiohttp would label a str/bytes body text/plain or octet-stream.
+    return {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json",
+    }
+
+
+async def push_tx(session, path, access_token, signature, timestamp, request_body):
+
+    headers = {
+        **_base_headers(access_token),
+        "x-signature": base64.b64encode(signature).decode(),
+        "x-timestamp": timestamp,
+    }
+
+    resp_text = ""
     try:
-        resp_tx = requests.post(
-            f"https://api.fordefi.com{path}",
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "x-signature": base64.b64encode(signature),
-                "x-timestamp": timestamp.encode(),
-            },
-            data=request_body,
-        )
-        resp_tx.raise_for_status()
-        return resp_tx
-
-    except requests.exceptions.HTTPError as e:
+        for attempt in range(MAX_RETRIES + 1):
+            async with session.post(path, headers=headers, data=request_body) as resp_tx:
+                resp_text = await resp_tx.text()
+                if resp_tx.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                    await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+                    continue
+                resp_tx.raise_for_status()
+                return json.loads(resp_text)
+
+    except aiohttp.ClientResponseError as e:
         error_message = f"HTTP error occurred: {str(e)}"
-        if resp_tx.text:
+        if resp_text:
             try:
-                error_detail = resp_tx.json()
+                error_detail = json.loads(resp_text)
                 error_message += f"\nError details: {error_detail}"
             except json.JSONDecodeError:
-                error_message += f"\nRaw response: {resp_tx.text}"
+                error_message += f"\nRaw response: {resp_text}"
         raise RuntimeError(error_message)
-    except requests.exceptions.RequestException as e:
-        raise RuntimeError(f"Network error occurred: {str(e)}")
\ No newline at end of file
+    except aiohttp.ClientError as e:
+        raise RuntimeError(f"Network error occurred: {str(e)}")
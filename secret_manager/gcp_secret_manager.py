@@ -1,11 +1,40 @@
+import time
+import threading
+from typing import Optional
 from google.cloud import secretmanager
 
+# Secrets are re-fetched from GCP at most once per SECRET_TTL_SECONDS
+SECRET_TTL_SECONDS = 3600
+
+# One client (gRPC channel + credentials) for the whole process. access_secret is
+# called from asyncio.to_thread workers, so the first initialization is lock-guarded.
+_CLIENT: Optional[secretmanager.SecretManagerServiceClient] = None
+_CLIENT_LOCK = threading.Lock()
+_secret_cache = {}
+
+
+def _get_client():
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = secretmanager.SecretManagerServiceClient()
+    return _CLIENT
+
 
 # Helper function to fetch a secret from GCP's Secret Manager
 def access_secret(project_id, secret_id, version_id):
 
-    client = secretmanager.SecretManagerServiceClient()
     name = f"projects/{project_id}/secrets/{secret_id}/versions/{version_id}"
-    response = client.access_secret_version(request={"name": name})
 
-    return response.payload.data.decode('UTF-8')
\ No newline at end of file
+    cached = _secret_cache.get(name)
+    if cached is not None:
+        value, fetched_at = cached
+        if time.time() - fetched_at <= SECRET_TTL_SECONDS:
+            return value
+
+    response = _get_client().access_secret_version(request={"name": name})
+    value = response.payload.data.decode('UTF-8')
+    _secret_cache[name] = (value, time.time())
+
+    return value
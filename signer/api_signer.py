@@ -11,8 +11,12 @@ def sign(payload, project):
     # Signs the payload
     signing_key = ecdsa.SigningKey.from_pem(pem_content)
 
+    # Payload may already be bytes, in which case there is nothing to encode
+    if isinstance(payload, str):
+        payload = payload.encode()
+
     signature = signing_key.sign(
-        data=payload.encode(), hashfunc=hashlib.sha256, sigencode=ecdsa.util.sigencode_der
+        data=payload, hashfunc=hashlib.sha256, sigencode=ecdsa.util.sigencode_der
     )
 
     return signature
\ No newline at end of file
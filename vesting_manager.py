@@ -1,11 +1,17 @@
-import schedule
-import time
+import heapq
+import logging
+import asyncio
+import itertools
 import pytz
+from types import MappingProxyType
+from typing import Mapping
 import firebase_admin
 from datetime import datetime, timedelta
+from push_to_api.push_tx import create_session
 from vesting_scripts.transfer_native_gcp import transfer_native_gcp
 from vesting_scripts.transfer_token_gcp import transfer_token_gcp
 from firebase_admin import firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
 
 # -------------------------------------------------
 # UTILITY
@@ -13,15 +19,39 @@ from firebase_admin import firestore
 # Each asset config is stored in Firebase for easier management
 # -------------------------------------------------
 
-def load_vesting_configs():
+logger = logging.getLogger(__name__)
+
+UTC = pytz.UTC
+# A Firestore write often touches several docs at once; wait this long after the last change before rescheduling
+RESCHEDULE_DEBOUNCE_SECONDS = 5
+# How often main_async checks that the Firestore listener is still alive
+LISTENER_CHECK_SECONDS = 300
+
+# Source of truth for the scheduler: vault_id -> tuple of read-only token configs, kept in sync by on_cfg_change.
+# All Firestore read cost is paid by the listener; nothing downstream (vests included) touches Firestore.
+_CONFIGS = {}
+# Event loop running the scheduler, so Firestore's listener thread can hand work back to it
+_loop = None
+_reschedule_handle = None
+# Vaults whose configs changed since the last reschedule
+_pending_vaults = set()
+# False until the listener has delivered its first snapshot
+_initial_snapshot_received = False
+
+# Shared Fordefi API session, opened in main_async so concurrent vests reuse keep-alive connections
+_http_session = None
+
+
+def parse_vesting_doc(doc):
     """
-    This function fetches vesting configurations from a Firestore collection named 'vesting_configs'.
+    This function turns one document of the Firestore collection named 'vesting_configs' into vesting configurations.
     
     Firestore DB Structure:
     ---------------------------------------
     Collection: vesting_configs
       Document ID: 652a2334-a673-4851-ad86-627781689592  <-- That's your Vault ID
         {
+          "active": true,  <-- Only active vaults are sent to us by Firestore
           "tokens": [
             {
               "asset": "BNB",
@@ -31,6 +61,7 @@ def load_vesting_configs():
               "value": "0.000001",
               "note": "Daily BNB vesting",
               "cliff_days": 0,
+              "start_date": "2025-01-15",  <-- The cliff counts from here; required when cliff_days > 0
               "vesting_time": "13:00",
               "destination": "0x..."
             },
@@ -48,55 +79,121 @@ def load_vesting_configs():
           ]
         }
 
-    Returns a list of config dictionaries, where each config has:
+    Returns a tuple of read-only config mappings, where each config has:
       - vault_id
       - asset, ecosystem, type, chain, destination, value, note
-      - cliff_days
+      - cliff_days, vesting_start (UTC datetime the cliff counts from, None without start_date)
       - vesting_time
     """
-    db = firestore.client()
     configs = []
+    doc_data = doc.to_dict()
+    vault_id = doc.id
+    tokens = doc_data.get("tokens", [])
+
+    # Each doc can contain an array of tokens arrays
+    for token_info in tokens:
+        # NOTE -> decided against putting the smart contract address in that DB because 
+        # the risk of mixing destination address and contract address are too great imo
+        # The Vesting time should be expressed UTC time
+        # The cliff needs a fixed anchor, otherwise every reschedule would restart it
+        if "start_date" in token_info:
+            vesting_start = datetime.strptime(token_info["start_date"], "%Y-%m-%d").replace(tzinfo=UTC)
+        elif token_info["cliff_days"] > 0:
+            logger.error(
+                "❌ %s (Vault ID: %s) has cliff_days=%s but no start_date to count it from, skipping it.",
+                token_info["asset"], vault_id, token_info["cliff_days"]
+            )
+            continue
+        else:
+            vesting_start = None
+
+        cfg = {
+            "vault_id": vault_id,
+            "asset":        token_info["asset"],
+            "ecosystem":    token_info["ecosystem"],
+            "type":         token_info["type"],
+            "chain":        token_info["chain"],
+            "destination":  token_info["destination"],
+            "value":        token_info["value"],
+            "note":         token_info["note"],
+            "cliff_days":   token_info["cliff_days"], # This should be UTC time
+            "vesting_start": vesting_start,
+            "vesting_time": token_info["vesting_time"]
+        }
+        configs.append(MappingProxyType(cfg))
 
-    # Retrieve all documents from the 'vesting_configs' collection on Firebase
-    docs = db.collection("vesting_configs").stream()
-
-    for doc in docs:
-        doc_data = doc.to_dict()
-        vault_id = doc.id
-        tokens = doc_data.get("tokens", [])
-
-        # Each doc can contain an array of tokens arrays
-        for token_info in tokens:
-            # NOTE -> decided against putting the smart contract address in that DB because 
-            # the risk of mixing destination address and contract address are too great imo
-            # The Vesting time should be expressed UTC time
-            cfg = {
-                "vault_id": vault_id,
-                "asset":        token_info["asset"],
-                "ecosystem":    token_info["ecosystem"],
-                "type":         token_info["type"],
-                "chain":        token_info["chain"],
-                "destination":  token_info["destination"],
-                "value":        token_info["value"],
-                "note":         token_info["note"],
-                "cliff_days":   token_info["cliff_days"], # This should be UTC time
-                "vesting_time": token_info["vesting_time"]
-            }
-            configs.append(cfg)
+    return tuple(configs)
+
+
+def load_vesting_configs():
+    """
+    Returns the current vesting configurations of every vault as one flat, immutable tuple.
+    Firestore is not queried here: _CONFIGS is kept up to date by the snapshot listener,
+    which is billed one read per vault document at startup and one per changed document after that.
+    """
+    return tuple(cfg for vault_configs in _CONFIGS.values() for cfg in vault_configs)
+
+
+def on_cfg_change(doc_snapshot, changes, read_time):
+    """
+    Firestore snapshot listener for the 'vesting_configs' collection. Firestore pushes the
+    initial documents and then only the deltas, so we only pay reads when a config changes.
+
+    NOTE: this runs on Firestore's watch thread, not on the event loop. Only the changed
+    documents are parsed here; _CONFIGS itself is updated on the loop by apply_cfg_changes.
+    An exception escaping this callback would stop the listener for good, so a document
+    that can't be parsed is logged and skipped (its vault keeps its previous schedule).
+    """
+    global _initial_snapshot_received
+    if not _initial_snapshot_received:
+        _initial_snapshot_received = True
+        if not doc_snapshot:
+            logger.warning(
+                "No active vesting configs found. Only documents with 'active': true in 'vesting_configs' "
+                "are scheduled; add that field to existing vault documents."
+            )
+
+    updates = {}
+    for change in changes:
+        doc = change.document
+        try:
+            updates[doc.id] = None if change.type.name == "REMOVED" else parse_vesting_doc(doc)
+        except Exception:
+            logger.exception("❌ Invalid vesting config for Vault ID %s, keeping its previous schedule.", doc.id)
+    _loop.call_soon_threadsafe(apply_cfg_changes, updates)
+
+
+def apply_cfg_changes(updates: dict):
+    """
+    Stores the changed vaults (None means removed) and schedules a debounced reschedule,
+    so a burst of config changes results in a single refresh.
+    """
+    global _reschedule_handle
+    for vault_id, vault_configs in updates.items():
+        if vault_configs is None:
+            _CONFIGS.pop(vault_id, None)
+        else:
+            _CONFIGS[vault_id] = vault_configs
+    _pending_vaults.update(updates)
 
-    return configs
+    if _reschedule_handle is not None:
+        _reschedule_handle.cancel()
+    _reschedule_handle = _loop.call_later(RESCHEDULE_DEBOUNCE_SECONDS, refresh_vesting_schedules)
 
 
-def execute_vest_for_asset(cfg: dict):
+async def execute_vest_for_asset(cfg: Mapping):
     """
     Execute a single vest for the given asset/config.
+    Everything the vest needs is in cfg, so this never calls Firestore.
     """
-    print(f"\n🔔 It's vesting time for {cfg['asset']} (Vault ID: {cfg['vault_id']})!")
+    logger.info("🔔 It's vesting time for %s (Vault ID: %s)!", cfg['asset'], cfg['vault_id'])
     try:
         if cfg["type"] == "native" and cfg["ecosystem"] == "evm" and cfg["value"] != "0":
             # Send native EVM token (BNB, ETH, etc.)
-            transfer_native_gcp(
+            await transfer_native_gcp(
+                session=_http_session,
                 chain=cfg["chain"],
+                native_asset=cfg["asset"],
                 vault_id=cfg["vault_id"],
                 destination=cfg["destination"],
                 value=cfg["value"],
@@ -104,7 +201,8 @@ def execute_vest_for_asset(cfg: dict):
             )
         elif cfg["type"] == "erc20" and cfg["ecosystem"] == "evm" and cfg["value"] != "0":
             # Send ERC20 token (USDT, USDC, etc.)
-            transfer_token_gcp(
+            await transfer_token_gcp(
+                session=_http_session,
                 chain=cfg["chain"],
                 token_ticker=cfg["asset"],
                 vault_id=cfg["vault_id"],
@@ -114,93 +212,199 @@ def execute_vest_for_asset(cfg: dict):
             )
         elif cfg["value"] == "0":
             # If the vesting amount is zero, just inform
-            print(f'❌ Vesting amount for {cfg["asset"]} in Firebase is 0!')
+            logger.warning("❌ Vesting amount for %s in Firebase is 0!", cfg["asset"])
         else:
             raise ValueError(f"Unsupported configuration: type={cfg['type']}, ecosystem={cfg['ecosystem']}")
 
-        print(f"✅ {cfg['asset']} vesting completed successfully.")
+        logger.info("✅ %s vesting completed successfully.", cfg['asset'])
     except Exception as e:
-        print(f"❌ Error during {cfg['asset']} vesting: {str(e)}")
+        logger.error("❌ Error during %s vesting: %s", cfg['asset'], e)
 
 
-def schedule_vesting_for_asset(cfg: dict, tag: str = "vesting"):
+async def execute_vests(configs: list):
+    """
+    Execute a batch of vests concurrently; with the shared HTTP session they complete
+    in about one round-trip instead of one per asset.
     """
-    We take the vesting time (HH:MM) and cliff_days from cfg, and do the following:
+    await asyncio.gather(*[execute_vest_for_asset(cfg) for cfg in configs], return_exceptions=True)
 
-    1) Compute the local day/time for the very first vest (including cliff_days).
-    2) If that time is already in the past 'today', push it to tomorrow.
-    3) Schedule that job to run daily at vest_hour:vest_minute (local system time).
 
-    NOTE: 'schedule' library by default runs on the system's local time -> need to check with GCP
+def compute_next_vesting_date(cfg: Mapping) -> datetime:
     """
-    vest_hour, vest_minute = map(int, cfg["vesting_time"].split(":"))
+    Returns the next time this asset vests, strictly after now. Used both for the first vest
+    and, once a vest has fired, for the following one.
 
-    # Calculate 'cliff_days' offset from now (in UTC).
-    now_utc = datetime.now(pytz.UTC)
-    first_vest_date_utc = now_utc + timedelta(days=cfg["cliff_days"])
+    We take the vesting time (HH:MM, UTC), vesting_start and cliff_days from cfg, and do the following:
 
-    # Convert from UTC to local server time zone
-    local_tz = pytz.timezone("CET") 
-    first_vest_local = first_vest_date_utc.astimezone(local_tz)
+    1) The cliff ends cliff_days after vesting_start (no cliff without one); nothing vests before that or before now.
+    2) Apply HH:MM (UTC) to the day of whichever comes last.
+    3) If that time is already in the past for that day, push it to the next day.
+    """
+    vest_hour, vest_minute = map(int, cfg["vesting_time"].split(":"))
+
+    # Calculate the end of the cliff from its fixed anchor (in UTC).
+    now_utc = datetime.now(UTC)
+    cliff_end_utc = now_utc
+    if cfg["vesting_start"] is not None:
+        cliff_end_utc = cfg["vesting_start"] + timedelta(days=cfg["cliff_days"])
 
     # Applies the vest_hour:vest_minute
-    first_vest_local = first_vest_local.replace(
+    first_vest_utc = max(now_utc, cliff_end_utc).replace(
         hour=vest_hour,
         minute=vest_minute,
         second=0,
         microsecond=0
     )
 
-    # If we've passed that local time for the day, push to tomorrow
-    now_local = datetime.now(local_tz)
-    if first_vest_local <= now_local:
-        first_vest_local += timedelta(days=1)
+    # If we've passed that time for the day, push to tomorrow
+    if first_vest_utc <= now_utc or first_vest_utc < cliff_end_utc:
+        first_vest_utc += timedelta(days=1)
+
+    return first_vest_utc
 
-    # Format the HH:MM in local time for schedule.every().day.at("HH:MM")
-    at_string = first_vest_local.strftime("%H:%M")
 
-    # Small function that's calling the vest
-    def daily_vest_job():
-        execute_vest_for_asset(cfg)
+# Min-heap of (due_utc, seq, cfg) for every upcoming vest; run_scheduler sleeps until the earliest one.
+# seq breaks ties between vests due at the same moment so dicts are never compared.
+_vesting_queue = []
+_vesting_seq = itertools.count()
+# Set whenever the queue is rebuilt, so run_scheduler re-evaluates its sleep (created in main_async)
+_queue_changed = None
+# Strong references to in-flight vests so the event loop doesn't garbage-collect them
+_vest_tasks = set()
 
-    # Schedule the job every day at the local time "CET"
-    schedule.every().day.at(at_string).do(daily_vest_job).tag(tag)
 
-    print(f"⏰ {cfg['asset']} (Vault ID: {cfg['vault_id']}) first daily vest scheduled for {first_vest_local} local time.")
+def schedule_vesting_for_asset(cfg: Mapping):
+    """
+    Queues the first vest of this asset. Once it fires, run_scheduler queues the
+    next one the same way, so the loop only wakes up when a vest is actually due.
+    """
+    first_run_utc = compute_next_vesting_date(cfg)
+    heapq.heappush(_vesting_queue, (first_run_utc, next(_vesting_seq), cfg))
+
+    logger.info("⏰ %s (Vault ID: %s) first daily vest scheduled for %s UTC.", cfg['asset'], cfg['vault_id'], first_run_utc)
+
+
+def _drop_queued_vests(vault_ids):
+    _vesting_queue[:] = [entry for entry in _vesting_queue if entry[2]["vault_id"] not in vault_ids]
+    heapq.heapify(_vesting_queue)
 
 
 def refresh_vesting_schedules():
     """
-    Clears out existing vesting jobs, reloads configs, and re-schedules them.
-    We call this daily so that any new config entries are picked up.
+    Drops the queued vests of the vaults that changed and re-schedules them from _CONFIGS.
+    Vests of untouched vaults keep their queue entries. A vault whose config can't be
+    scheduled is logged and skipped, so it can't hold back the others.
+    Called by apply_cfg_changes whenever the vesting configs change in Firestore.
     """
-    current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
-    print(f"\n--- Refreshing vesting schedules from Firestore at {current_time} ---")
-    schedule.clear('vesting')
+    vault_ids = set(_pending_vaults)
+    _pending_vaults.clear()
+    logger.info("--- Refreshing vesting schedules for %d vault(s) ---", len(vault_ids))
 
-    configs = load_vesting_configs()
-    print(f"Loaded {len(configs)} vesting configs.")
+    try:
+        _drop_queued_vests(vault_ids)
 
-    for cfg in configs:
-        schedule_vesting_for_asset(cfg, tag="vesting")
+        for vault_id in vault_ids:
+            try:
+                for cfg in _CONFIGS.get(vault_id, ()):
+                    schedule_vesting_for_asset(cfg)
+            except Exception:
+                logger.exception("❌ Could not schedule vests for Vault ID %s, skipping it.", vault_id)
+                _drop_queued_vests({vault_id})
 
+        logger.info("Loaded %d vesting configs.", len(load_vesting_configs()))
+    finally:
+        # Always wake run_scheduler, even if something above failed
+        _queue_changed.set()
 
-def main():
-    # 1) Initialize Firebase
-    firebase_admin.initialize_app()
-    print("Firebase initialized successfully!")
 
-    # 2) Initial refresh so we have tasks immediately
-    refresh_vesting_schedules()
+async def run_scheduler():
+    """
+    Sleeps until the earliest queued vest is due (or the queue is rebuilt), fires every
+    vest due by then and queues the same assets again for tomorrow. Runs forever.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        _queue_changed.clear()
+
+        delay = None
+        if _vesting_queue:
+            delay = (_vesting_queue[0][0] - datetime.now(UTC)).total_seconds()
+
+        if delay is None or delay > 0:
+            try:
+                await asyncio.wait_for(_queue_changed.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        # Collect every vest that is due now (e.g. several assets sharing a vesting_time)
+        now_utc = datetime.now(UTC)
+        bucket = []
+        while _vesting_queue and _vesting_queue[0][0] <= now_utc:
+            _, _, cfg = heapq.heappop(_vesting_queue)
+            bucket.append(cfg)
+
+        for cfg in bucket:
+            heapq.heappush(_vesting_queue, (compute_next_vesting_date(cfg), next(_vesting_seq), cfg))
 
-    # 3) Schedule a daily refresh at your_time UTC which is the local system time zone.
-    schedule.every().day.at("13:00", "UTC").do(refresh_vesting_schedules)
+        task = loop.create_task(execute_vests(bucket))
+        _vest_tasks.add(task)
+        task.add_done_callback(_vest_tasks.discard)
 
-    # 4) Keep the script alive
+
+def start_config_listener():
+    """
+    Registers on_cfg_change on the active vesting configs and returns the watch handle.
+    Filtering server-side means inactive vaults are never read (or billed).
+
+    NOTE: building the Firestore client and opening the watch stream are blocking gRPC
+    calls, so main_async runs this in a worker thread.
+    """
+    db = firestore.client()
+    active_configs = db.collection("vesting_configs").where(filter=FieldFilter("active", "==", True))
+    return active_configs.on_snapshot(on_cfg_change)
+
+
+async def watch_listener(watch):
+    """
+    The Python Firestore client has no error callback: if the watch stream fails for good,
+    updates silently stop. Check periodically and exit so the supervisor restarts the manager.
+    """
     while True:
-        schedule.run_pending()
-        time.sleep(60)
+        await asyncio.sleep(LISTENER_CHECK_SECONDS)
+        if not watch.is_active:
+            raise RuntimeError("Firestore listener on 'vesting_configs' stopped, exiting so the manager gets restarted")
+
+
+async def main_async():
+    global _http_session, _loop, _queue_changed
+    _loop = asyncio.get_running_loop()
+    _queue_changed = asyncio.Event()
+
+    async with create_session() as session:
+        _http_session = session
+
+        # 1) Listen to the active configs; the initial snapshot schedules every asset
+        watch = await asyncio.to_thread(start_config_listener)
+
+        # 2) Fire vests as they come due; this also keeps the loop (and the script) alive
+        #    until the listener dies
+        try:
+            await asyncio.gather(run_scheduler(), watch_listener(watch))
+        finally:
+            watch.unsubscribe()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    # 1) Initialize Firebase
+    firebase_admin.initialize_app()
+    logger.info("Firebase initialized successfully!")
+
+    # 2) Run the scheduler on an asyncio event loop
+    asyncio.run(main_async())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
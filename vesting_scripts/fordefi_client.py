@@ -0,0 +1,37 @@
+import orjson
+import asyncio
+import time
+from signer.api_signer import sign
+from push_to_api.push_tx import push_tx
+from secret_manager.gcp_secret_manager import access_secret
+
+# Set config
+GCP_PROJECT_ID = 'inspired-brand-447513-i8' # CHANGE to your GCP project name
+FORDEFI_API_USER_TOKEN = 'USER_API_TOKEN'
+TRANSACTIONS_PATH = "/api/v1/transactions"
+# Constant head of the signed "{path}|{timestamp}|{body}" payload
+PATH_PREFIX = (TRANSACTIONS_PATH + "|").encode()
+
+
+async def post_tx(session, request_json):
+    """
+    Sign a Fordefi transaction request with the API Signer and push it to the Fordefi API
+
+    Args:
+        session (aiohttp.ClientSession): Shared HTTP session used to reach the Fordefi API
+        request_json (dict): Transaction request, as built by the transfer scripts
+
+    Returns:
+        dict: Response from the Fordefi API
+    """
+    USER_API_TOKEN = await asyncio.to_thread(access_secret, GCP_PROJECT_ID, FORDEFI_API_USER_TOKEN, 'latest')
+
+    request_body = orjson.dumps(request_json)
+    timestamp = str(int(time.time()))
+    payload = b"%s%s|%s" % (PATH_PREFIX, timestamp.encode(), request_body)
+
+    # Sign transaction with API Signer
+    signature = await asyncio.to_thread(sign, payload=payload, project=GCP_PROJECT_ID)
+
+    # Push tx to Fordefi API
+    return await push_tx(session, TRANSACTIONS_PATH, USER_API_TOKEN, signature, timestamp, request_body)
@@ -1,10 +1,8 @@
-import json
-import datetime
-from decimal import Decimal
-from signer.api_signer import sign
-from push_to_api.push_tx import push_tx
-from configs.evm_tokens import EVM_TOKEN_CONFIGS
-from secret_manager.gcp_secret_manager import access_secret
+import logging
+from configs.evm_tokens import EVM_TOKEN_CONFIGS, to_base_units
+from vesting_scripts.fordefi_client import post_tx
+
+logger = logging.getLogger(__name__)
 
 ### FUNCTIONS
 def evm_tx_native(evm_chain, native_asset, vault_id, destination, custom_note, value):
@@ -21,9 +19,9 @@ def evm_tx_native(evm_chain, native_asset, vault_id, destination, custom_note, v
 
     token_config = EVM_TOKEN_CONFIGS[evm_chain][sanitized_native_asset_name]
     decimals = token_config["decimals"]
-    value = str(int(Decimal(value) * Decimal(10**decimals)))
+    value = str(to_base_units(value, decimals))
 
-    print(f"⚙️ Preparing {native_asset} tx for {value}!")
+    logger.info("⚙️ Preparing %s tx for %s!", native_asset, value)
 
     request_json = {
         "signer_type": "api_signer",
@@ -54,12 +52,14 @@ def evm_tx_native(evm_chain, native_asset, vault_id, destination, custom_note, v
     return request_json
 
 ### Core logic
-def transfer_native_gcp(chain, vault_id, destination, value, note):
+async def transfer_native_gcp(session, chain, native_asset, vault_id, destination, value, note):
     """
     Execute a native token transfer (BNB/ETH) using Fordefi API
     
     Args:
+        session (aiohttp.ClientSession): Shared HTTP session used to reach the Fordefi API
         chain (str): Chain identifier (e.g., "bsc", "eth")
+        native_asset (str): Native asset ticker (e.g., "BNB", "ETH")
         vault_id (str): Fordefi vault ID
         destination (str): Destination wallet address
         value (str): Amount to transfer in native units (e.g., "0.0001")
@@ -68,27 +68,15 @@ def transfer_native_gcp(chain, vault_id, destination, value, note):
     Returns:
         dict: Response from the Fordefi API
     """
-    # Set config
-    GCP_PROJECT_ID = 'inspired-brand-447513-i8' # CHANGE to your GCP project name
-    FORDEFI_API_USER_TOKEN = 'USER_API_TOKEN'
-    USER_API_TOKEN = access_secret(GCP_PROJECT_ID, FORDEFI_API_USER_TOKEN, 'latest')
-    path = "/api/v1/transactions"
-
     # Building transaction
     request_json = evm_tx_native(
         evm_chain=chain,
+        native_asset=native_asset,
         vault_id=vault_id,
         destination=destination,
         custom_note=note,
         value=value
     )
-    request_body = json.dumps(request_json)
-    timestamp = datetime.datetime.now().strftime("%s")
-    payload = f"{path}|{timestamp}|{request_body}"
-
-    # Sign transaction with API Signer
-    signature = sign(payload=payload, project=GCP_PROJECT_ID)
 
-    # Push tx to Fordefi API
-    resp_tx = push_tx(path, USER_API_TOKEN, signature, timestamp, request_body)
-    return resp_tx.json()
\ No newline at end of file
+    # Sign and push tx to Fordefi API
+    return await post_tx(session, request_json)
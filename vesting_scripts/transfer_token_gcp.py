@@ -1,24 +1,17 @@
-import json
-import datetime
-from decimal import Decimal
-from signer.api_signer import sign
-from push_to_api.push_tx import push_tx
-from configs.evm_tokens import EVM_TOKEN_CONFIGS
-from secret_manager.gcp_secret_manager import access_secret
+from configs.evm_tokens import EVM_TOKEN_TABLE, to_base_units
+from vesting_scripts.fordefi_client import post_tx
 
 ### FUNCTIONS
 def evm_tx_tokens(evm_chain, vault_id, destination, custom_note, value, token):
 
     sanitized_token_name = token.lower().strip()
 
-    if evm_chain not in EVM_TOKEN_CONFIGS or sanitized_token_name not in EVM_TOKEN_CONFIGS[evm_chain]:
-        raise ValueError(f"Token '{token}' is not supported for chain '{evm_chain}'")
-    
-    token_config = EVM_TOKEN_CONFIGS[evm_chain][sanitized_token_name]
-    decimals = token_config["decimals"]
-    contract_address = token_config["contract_address"]
-    
-    value = str(int(Decimal(value) * Decimal(10**decimals)))
+    try:
+        contract_address, decimals = EVM_TOKEN_TABLE[(evm_chain, sanitized_token_name)]
+    except KeyError:
+        raise ValueError(f"Token '{token}' is not supported for chain '{evm_chain}'") from None
+
+    value = str(to_base_units(value, decimals))
 
     request_json =  {
     "signer_type": "api_signer",
@@ -52,11 +45,12 @@ def evm_tx_tokens(evm_chain, vault_id, destination, custom_note, value, token):
     return request_json
 
 ### Core logic
-def transfer_token_gcp(chain, token_ticker, vault_id, destination, amount, note):
+async def transfer_token_gcp(session, chain, token_ticker, vault_id, destination, amount, note):
     """
     Execute an ERC20 token transfer using Fordefi API
     
     Args:
+        session (aiohttp.ClientSession): Shared HTTP session used to reach the Fordefi API
         chain (str): Chain identifier (e.g., "bsc", "eth")
         token_address (str): Contract address of the token
         vault_id (str): Fordefi vault ID
@@ -67,12 +61,6 @@ def transfer_token_gcp(chain, token_ticker, vault_id, destination, amount, note)
     Returns:
         dict: Response from the Fordefi API
     """
-    # Set config
-    GCP_PROJECT_ID = 'inspired-brand-447513-i8' ## CHANGE to your GCP project name
-    FORDEFI_API_USER_TOKEN = 'USER_API_TOKEN'
-    USER_API_TOKEN = access_secret(GCP_PROJECT_ID, FORDEFI_API_USER_TOKEN, 'latest')
-    path = "/api/v1/transactions"
-
     # Building transaction
     request_json = evm_tx_tokens(
         evm_chain=chain,
@@ -82,13 +70,6 @@ def transfer_token_gcp(chain, token_ticker, vault_id, destination, amount, note)
         value=amount,
         token=token_ticker
     )
-    request_body = json.dumps(request_json)
-    timestamp = datetime.datetime.now().strftime("%s")
-    payload = f"{path}|{timestamp}|{request_body}"
-
-    # Sign transaction with API Signer
-    signature = sign(payload=payload, project=GCP_PROJECT_ID)
 
-    # Push tx to Fordefi API
-    resp_tx = push_tx(path, USER_API_TOKEN, signature, timestamp, request_body)
-    return resp_tx.json()
\ No newline at end of file
+    # Sign and push tx to Fordefi API
+    return await post_tx(session, request_json)